@@ -0,0 +1,135 @@
+"""
+Compiled inner loops for the navigation tab of app.py (A* search + LIDAR raycast).
+Both kernels work on a (w, h) boolean obstacle grid and plain integer coordinates.
+If numba is not installed, `njit` is a no-op and NUMBA_AVAILABLE is False so
+app.py can fall back to its NumPy / pure-Python versions.
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+# ---------- binary heap on parallel arrays (key = f << 32 | insertion order) ----------
+@njit(cache=True)
+def _heap_push(keys, nodes, size, key, node):
+    i = size
+    keys[i] = key
+    nodes[i] = node
+    while i > 0:
+        parent = (i - 1) >> 1
+        if keys[parent] <= keys[i]:
+            break
+        keys[parent], keys[i] = keys[i], keys[parent]
+        nodes[parent], nodes[i] = nodes[i], nodes[parent]
+        i = parent
+    return size + 1
+
+@njit(cache=True)
+def _heap_pop(keys, nodes, size):
+    node = nodes[0]
+    size -= 1
+    keys[0] = keys[size]
+    nodes[0] = nodes[size]
+    i = 0
+    while True:
+        left = 2 * i + 1
+        if left >= size:
+            break
+        child = left
+        if left + 1 < size and keys[left + 1] < keys[left]:
+            child = left + 1
+        if keys[i] <= keys[child]:
+            break
+        keys[child], keys[i] = keys[i], keys[child]
+        nodes[child], nodes[i] = nodes[i], nodes[child]
+        i = child
+    return node, size
+
+# ---------- A* ----------
+# neighbor offsets, same order as app.NEIGHBOR_DIRS (numba freezes globals as constants)
+_DIRS = np.array([[1, 0], [-1, 0], [0, 1], [0, -1]], dtype=np.int32)
+
+@njit(cache=True)
+def a_star_nb(sx, sy, gx, gy, obs_grid):
+    """Return (n, 2) int32 array of path cells from start to goal, empty if unreachable."""
+    w, h = obs_grid.shape
+    g = np.full(w * h, -1, np.int32)
+    came_from = np.full(w * h, -1, np.int32)
+    closed = np.zeros(w * h, np.bool_)
+    # every cell is pushed at most once per incoming edge
+    keys = np.empty(4 * w * h + 1, np.int64)
+    nodes = np.empty(4 * w * h + 1, np.int32)
+    counter = 0
+    start = sx * h + sy
+    goal = gx * h + gy
+    g[start] = 0
+    size = _heap_push(keys, nodes, 0, np.int64(abs(sx - gx) + abs(sy - gy)) << 32, start)
+    found = False
+    while size > 0:
+        current, size = _heap_pop(keys, nodes, size)
+        if closed[current]:
+            continue
+        if current == goal:
+            found = True
+            break
+        closed[current] = True
+        x = current // h
+        y = current % h
+        for k in range(4):
+            nx = x + _DIRS[k, 0]
+            ny = y + _DIRS[k, 1]
+            if nx < 0 or nx >= w or ny < 0 or ny >= h or obs_grid[nx, ny]:
+                continue
+            nb = nx * h + ny
+            if closed[nb]:
+                continue
+            tentative_g = g[current] + 1
+            if g[nb] < 0 or tentative_g < g[nb]:
+                came_from[nb] = current
+                g[nb] = tentative_g
+                counter += 1
+                f = tentative_g + abs(nx - gx) + abs(ny - gy)
+                size = _heap_push(keys, nodes, size, (np.int64(f) << 32) | counter, nb)
+    if not found:
+        return np.empty((0, 2), np.int32)
+    # Reconstruct path
+    n = g[goal] + 1
+    path = np.empty((n, 2), np.int32)
+    current = goal
+    for i in range(n - 1, -1, -1):
+        path[i, 0] = current // h
+        path[i, 1] = current % h
+        current = came_from[current]
+    return path
+
+# ---------- LIDAR ----------
+@njit(cache=True)
+def cast_lidar_rays_nb(ox, oy, obs_grid, rays, max_range):
+    """Return (rays, 2) int32 array of end cells where the ray stopped or max range reached."""
+    w, h = obs_grid.shape
+    hits = np.empty((rays, 2), np.int32)
+    for i in range(rays):
+        angle = (2 * math.pi) * (i / rays)
+        dx = math.cos(angle)
+        dy = math.sin(angle)
+        hx, hy = ox, oy
+        dist = 0.0
+        while dist < max_range:
+            hx = min(max(int(round(ox + dx * dist)), 0), w - 1)
+            hy = min(max(int(round(oy + dy * dist)), 0), h - 1)
+            if obs_grid[hx, hy]:
+                break
+            dist += 0.25
+        hits[i, 0] = hx
+        hits[i, 1] = hy
+    return hits
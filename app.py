@@ -1,10 +1,14 @@
-import math
 import time
-import random
-from collections import deque
+import heapq
+import itertools
+import functools
 import numpy as np
 import streamlit as st
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from matplotlib.colors import ListedColormap
+from _kernels import NUMBA_AVAILABLE, a_star_nb, cast_lidar_rays_nb
 
 # ---------------------------- PAGE CONFIG & THEME ----------------------------
 st.set_page_config(
@@ -68,92 +72,177 @@ hr {
 """, unsafe_allow_html=True)
 
 # ---------------------------- SESSION STATE SETUP ----------------------------
+class RingBuffer:
+    """Fixed-size float32 sample history; once full, the oldest samples are overwritten."""
+
+    def __init__(self, size):
+        self.buf = np.zeros(size, dtype=np.float32)
+        self.head = 0    # next write position
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float32)[-len(self.buf):]
+        idx = (self.head + np.arange(len(values))) % len(self.buf)
+        self.buf[idx] = values
+        self.head = (self.head + len(values)) % len(self.buf)
+        self.count = min(self.count + len(values), len(self.buf))
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def last(self, default):
+        return float(self.buf[self.head - 1]) if self.count else default
+
+    def values(self):
+        """Samples in chronological order (a view while the buffer is filling)."""
+        if self.count < len(self.buf):
+            return self.buf[:self.count]
+        return np.concatenate((self.buf[self.head:], self.buf[:self.head]))
+
+def style_axes(ax, title):
+    ax.set_title(title, color="#d4e6ff")
+    ax.set_facecolor("#0b1326")
+    for spine in ax.spines.values():
+        spine.set_color("#2b3b5a")
+
+def make_ecg_figure():
+    fig = Figure(figsize=(10, 2.6))
+    ax = fig.subplots()
+    line, = ax.plot([], [], linewidth=1.6)
+    ax.set_ylim(-0.8, 1.8)
+    ax.set_yticks([])
+    ax.set_xticks([])
+    style_axes(ax, "ECG-like Heart Signal")
+    return fig, ax, line
+
+def make_vitals_figure():
+    fig = Figure(figsize=(10, 2.4))
+    ax = fig.subplots()
+    lines = (
+        ax.plot([], [], label="SpO₂", linewidth=1.6)[0],
+        ax.plot([], [], label="BP Systolic", linewidth=1.2)[0],
+        ax.plot([], [], label="BP Diastolic", linewidth=1.2)[0],
+    )
+    ax.set_ylim(60, 140)
+    ax.legend()
+    style_axes(ax, "SpO₂ and Blood Pressure")
+    return fig, ax, lines
+
+def make_nav_figure():
+    fig = Figure(figsize=(12, 7))
+    ax = fig.subplots()
+    return fig, ax
+
 def init_state():
     ss = st.session_state
     # Monitoring flags & data
     ss.setdefault("monitoring_on", False)
-    ss.setdefault("hb_data", deque(maxlen=300))   # heart-beat signal
-    ss.setdefault("spo2_data", deque(maxlen=120))
-    ss.setdefault("bp_sys_data", deque(maxlen=120))
-    ss.setdefault("bp_dia_data", deque(maxlen=120))
+    if "hb_data" not in ss:
+        ss.hb_data = RingBuffer(300)   # heart-beat signal
+        ss.spo2_data = RingBuffer(120)
+        ss.bp_sys_data = RingBuffer(120)
+        ss.bp_dia_data = RingBuffer(120)
     ss.setdefault("last_update_ts", 0.0)
+    ss.setdefault("mon_tick", 0)
+    # Figures are built once per session and updated in place
+    if "ecg_fig" not in ss:
+        ss.ecg_fig, ss.ecg_ax, ss.ecg_line = make_ecg_figure()
+    if "vitals_fig" not in ss:
+        ss.vitals_fig, ss.vitals_ax, ss.vitals_lines = make_vitals_figure()
 
     # Navigation flags & data
     ss.setdefault("nav_on", False)
     ss.setdefault("grid_w", 30)
     ss.setdefault("grid_h", 18)
     ss.setdefault("cell_px", 20)
-    ss.setdefault("obstacles", set())
+    ss.setdefault("obs_grid", np.zeros((ss.grid_w, ss.grid_h), dtype=bool))   # obstacles, [x, y]
+    ss.setdefault("obs_version", 0)      # bumped on every obstacle change
     ss.setdefault("start", (2, 9))       # patient room
     ss.setdefault("goal", (27, 9))       # pharmacy
     ss.setdefault("robot_pos", (2, 9))
-    ss.setdefault("path", [])
+    ss.setdefault("path", ())
+    ss.setdefault("path_idx", 0)         # index of the robot's cell in path
+    ss.setdefault("path_key", None)      # (start, goal, obs_version) the path was planned for
     ss.setdefault("lidar_range", 10)     # cells
     ss.setdefault("lidar_rays", 72)      # 5 degrees
     ss.setdefault("last_nav_update", 0.0)
+    if "nav_fig" not in ss:
+        ss.nav_fig, ss.nav_ax = make_nav_figure()
 
 init_state()
 
 # ---------------------------- HELPERS: MONITORING ----------------------------
-def generate_ecg_point(t, bpm=78):
-    """Simple synthetic ECG-like waveform (not medical-accurate)."""
-    # Period in seconds
-    period = 60.0 / bpm
-    phase = (t % period) / period  # 0..1
-    # Create a stylized P-QRS-T shape using piecewise bumps
+ECG_TABLE_SIZE = 1024   # samples per heartbeat period
+
+@functools.lru_cache(maxsize=1)
+def _ecg_template():
+    """One heartbeat of the stylized P-QRS-T shape, sampled over phase 0..1."""
+    phase = np.linspace(0, 1, ECG_TABLE_SIZE, endpoint=False)
     # baseline
     y = 0.02 * np.sin(2 * np.pi * 5 * phase)
 
-    # P wave
-    if 0.08 < phase < 0.16:
-        y += 0.1 * math.exp(-((phase - 0.12) ** 2) / 0.0008)
+    def bump(amp, center, width, lo, hi):
+        # Gaussian bump restricted to its (lo, hi) phase window
+        window = (phase > lo) & (phase < hi)
+        return np.where(window, amp * np.exp(-((phase - center) ** 2) / width), 0.0)
 
+    # P wave
+    y += bump(0.1, 0.12, 0.0008, 0.08, 0.16)
     # QRS complex
-    if 0.18 < phase < 0.24:
-        y -= 0.6 * math.exp(-((phase - 0.20) ** 2) / 0.00009)  # Q small dip
-    if 0.20 < phase < 0.22:
-        y += 1.4 * math.exp(-((phase - 0.21) ** 2) / 0.000015) # R spike
-    if 0.22 < phase < 0.26:
-        y -= 0.3 * math.exp(-((phase - 0.24) ** 2) / 0.00009)  # S dip
-
+    y += bump(-0.6, 0.20, 0.00009, 0.18, 0.24)   # Q small dip
+    y += bump(1.4, 0.21, 0.000015, 0.20, 0.22)   # R spike
+    y += bump(-0.3, 0.24, 0.00009, 0.22, 0.26)   # S dip
     # T wave
-    if 0.34 < phase < 0.50:
-        y += 0.25 * math.exp(-((phase - 0.42) ** 2) / 0.0025)
+    y += bump(0.25, 0.42, 0.0025, 0.34, 0.50)
+    return y
 
+def generate_ecg_samples(ts, bpm=78):
+    """Simple synthetic ECG-like waveform (not medical-accurate), one value per timestamp."""
+    # Period in seconds
+    period = 60.0 / bpm
+    # The shape only depends on phase, so one precomputed period serves every BPM
+    idx = (np.mod(ts, period) / period * ECG_TABLE_SIZE).astype(np.int64) & (ECG_TABLE_SIZE - 1)
     # Add small noise
-    y += np.random.normal(0, 0.01)
-    # Scale to typical mV-ish and offset
-    return y
+    return _ecg_template()[idx] + np.random.normal(0, 0.01, len(idx))
 
-def simulate_spo2_value():
-    base = 97 + np.random.normal(0, 0.4)
-    return max(92, min(100, base))
+def simulate_spo2_values(n):
+    base = 97 + np.random.normal(0, 0.4, n)
+    return np.clip(base, 92, 100)
 
-def simulate_bp_values():
+def simulate_bp_values(n):
     # Systolic ~ 110-125, Diastolic ~ 70-85
-    sys = 118 + np.random.normal(0, 3.5)
-    dia = 78 + np.random.normal(0, 2.5)
-    return int(sys), int(dia)
+    sys = 118 + np.random.normal(0, 3.5, n)
+    dia = 78 + np.random.normal(0, 2.5, n)
+    return sys.astype(int), dia.astype(int)
 
 # ---------------------------- HELPERS: NAVIGATION (A*) ----------------------------
-def neighbors(pt, w, h):
-    (x, y) = pt
-    for dx, dy in [(1,0),(-1,0),(0,1),(0,-1)]:
-        nx, ny = x+dx, y+dy
-        if 0 <= nx < w and 0 <= ny < h:
-            yield (nx, ny)
+NAV_TICK = 0.15   # seconds per robot step while navigating
+OBSTACLE_CMAP = ListedColormap([(0, 0, 0, 0), "#2e3b5a"])   # free cells transparent
+NEIGHBOR_DIRS = ((1,0),(-1,0),(0,1),(0,-1))
 
 def heuristic(a, b):
     # Manhattan distance
     return abs(a[0]-b[0]) + abs(a[1]-b[1])
 
-def a_star(start, goal, w, h, obstacles):
-    open_set = {start}
+def a_star(start, goal, obs_grid):
+    if NUMBA_AVAILABLE:
+        path = a_star_nb(start[0], start[1], goal[0], goal[1], obs_grid)
+        return tuple(tuple(p) for p in path.tolist())
+    w, h = obs_grid.shape
+    counter = itertools.count()
+    open_heap = [(heuristic(start, goal), next(counter), start)]
+    closed = set()
     came_from = {}
     g = {start: 0}
-    f = {start: heuristic(start, goal)}
-    while open_set:
-        current = min(open_set, key=lambda n: f.get(n, float('inf')))
+    while open_heap:
+        _, _, current = heapq.heappop(open_heap)
+        # Outdated heap entries are left in place and skipped on pop
+        if current in closed:
+            continue
         if current == goal:
             # Reconstruct path
             path = [current]
@@ -161,57 +250,80 @@ def a_star(start, goal, w, h, obstacles):
                 current = came_from[current]
                 path.append(current)
             path.reverse()
-            return path
-        open_set.remove(current)
-        for nb in neighbors(current, w, h):
-            if nb in obstacles:
+            return tuple(path)
+        closed.add(current)
+        x, y = current
+        for dx, dy in NEIGHBOR_DIRS:
+            nx, ny = x+dx, y+dy
+            if not (0 <= nx < w and 0 <= ny < h) or obs_grid[nx, ny]:
+                continue
+            nb = (nx, ny)
+            if nb in closed:
                 continue
             tentative_g = g[current] + 1
             if tentative_g < g.get(nb, float('inf')):
                 came_from[nb] = current
                 g[nb] = tentative_g
-                f[nb] = tentative_g + heuristic(nb, goal)
-                open_set.add(nb)
-    return []
+                heapq.heappush(open_heap, (tentative_g + heuristic(nb, goal), next(counter), nb))
+    return ()
 
-def cast_lidar_rays(pos, obstacles, w, h, rays=72, max_range=10):
-    """Return list of (end_x, end_y) cells where the ray stopped or max range reached."""
+@st.cache_data(max_entries=64, show_spinner=False)
+def a_star_cached(start, goal, w, h, obs_bytes):
+    """a_star memoized on the obstacle bitmap (obs_grid.tobytes()), so reruns reuse the path."""
+    obs_grid = np.frombuffer(obs_bytes, dtype=bool).reshape(w, h)
+    return a_star(start, goal, obs_grid)
+
+def set_obstacles(obs_grid):
+    ss = st.session_state
+    ss.obs_grid = obs_grid
+    ss.obs_version += 1
+
+def plan_path(start, goal):
+    """Run A* into session state, unless start, goal and obstacles are unchanged since the last plan."""
+    ss = st.session_state
+    key = (start, goal, ss.obs_version)
+    if ss.path_key != key:
+        ss.path = a_star_cached(start, goal, ss.grid_w, ss.grid_h, ss.obs_grid.tobytes())
+        ss.path_idx = 0
+        ss.path_key = key
+    return ss.path
+
+@functools.lru_cache(maxsize=8)
+def _ray_directions(rays):
+    angles = (2 * np.pi) * (np.arange(rays) / rays)
+    return np.cos(angles), np.sin(angles)
+
+def cast_lidar_rays(pos, obs_grid, rays=72, max_range=10):
+    """Return (rays, 2) array of end cells where the ray stopped or max range reached."""
+    if NUMBA_AVAILABLE:
+        return cast_lidar_rays_nb(pos[0], pos[1], obs_grid, rays, float(max_range))
+    w, h = obs_grid.shape
     ox, oy = pos
-    hits = []
-    for i in range(rays):
-        angle = (2 * math.pi) * (i / rays)
-        dx = math.cos(angle)
-        dy = math.sin(angle)
-        dist = 0.0
-        cx, cy = ox, oy
-        hit = (ox, oy)
-        while dist < max_range:
-            # step in small increments and map to nearest cell
-            cx_f = ox + dx * dist
-            cy_f = oy + dy * dist
-            cell = (min(max(int(round(cx_f)), 0), w-1),
-                    min(max(int(round(cy_f)), 0), h-1))
-            if cell in obstacles:
-                hit = cell
-                break
-            hit = cell
-            dist += 0.25
-        hits.append(hit)
-    return hits
+    dx, dy = _ray_directions(rays)
+    # Sample every ray at the same 0.25-cell steps and map to nearest cell
+    t = np.arange(0, max_range, 0.25)
+    xs = np.clip(np.round(ox + dx[:, None] * t[None, :]).astype(np.int32), 0, w-1)
+    ys = np.clip(np.round(oy + dy[:, None] * t[None, :]).astype(np.int32), 0, h-1)
+    hitmask = obs_grid[xs, ys]
+    stop = np.where(hitmask.any(axis=1), hitmask.argmax(axis=1), len(t) - 1)
+    idx = np.arange(rays)
+    return np.column_stack((xs[idx, stop], ys[idx, stop]))
+
+def grid_segments(w, h):
+    """(w+h+2, 2, 2) array of vertical then horizontal grid-line segments."""
+    xs = np.arange(w+1)
+    ys = np.arange(h+1)
+    v_segs = np.stack([np.column_stack([xs, np.zeros_like(xs)]), np.column_stack([xs, np.full_like(xs, h)])], axis=1)
+    h_segs = np.stack([np.column_stack([np.zeros_like(ys), ys]), np.column_stack([np.full_like(ys, w), ys])], axis=1)
+    return np.concatenate([v_segs, h_segs])
 
 def randomize_obstacles(w, h, start, goal, density=0.14, margin=2):
-    obs = set()
-    for x in range(w):
-        for y in range(h):
-            if (x, y) in [start, goal]:
-                continue
-            # Keep clear corridor around start & goal
-            if abs(x-start[0])<=margin and abs(y-start[1])<=margin:
-                continue
-            if abs(x-goal[0])<=margin and abs(y-goal[1])<=margin:
-                continue
-            if random.random() < density:
-                obs.add((x, y))
+    """Return a boolean (w, h) obstacle grid."""
+    obs = np.random.default_rng().random((w, h)) < density
+    # Keep clear corridor around start & goal
+    xs, ys = np.indices((w, h))
+    for cx, cy in (start, goal):
+        obs[(np.abs(xs-cx) <= margin) & (np.abs(ys-cy) <= margin)] = False
     return obs
 
 # ---------------------------- HEADER / NAV ----------------------------
@@ -261,10 +373,10 @@ with tabs[0]:
     with col2:
         st.markdown("**Live Status**")
         m1, m2, m3 = st.columns(3)
-        hb = st.session_state.hb_data[-1] if st.session_state.hb_data else 0.0
-        spo2 = int(st.session_state.spo2_data[-1]) if st.session_state.spo2_data else 98
-        bps = st.session_state.bp_sys_data[-1] if st.session_state.bp_sys_data else 118
-        bpd = st.session_state.bp_dia_data[-1] if st.session_state.bp_dia_data else 78
+        hb = st.session_state.hb_data.last(0.0)
+        spo2 = int(st.session_state.spo2_data.last(98))
+        bps = st.session_state.bp_sys_data.last(118)
+        bpd = st.session_state.bp_dia_data.last(78)
         m1.metric("ECG Signal (mV)", f"{hb:+.2f}")
         m2.metric("SpO₂ (%)", f"{spo2}")
         m3.metric("BP (mmHg)", f"{int(bps)}/{int(bpd)}")
@@ -293,73 +405,60 @@ with tabs[1]:
     with c4:
         speed = st.selectbox("Update Speed", ["Slow", "Normal", "Fast"], index=1)
 
-    # Live Metrics
-    m1, m2, m3 = st.columns(3)
-    hb_val = st.session_state.hb_data[-1] if st.session_state.hb_data else 0.0
-    m1.metric("ECG (mV)", f"{hb_val:+.2f}")
-    last_spo2 = int(st.session_state.spo2_data[-1]) if st.session_state.spo2_data else 98
-    m2.metric("SpO₂ (%)", f"{last_spo2}")
-    bps = st.session_state.bp_sys_data[-1] if st.session_state.bp_sys_data else 118
-    bpd = st.session_state.bp_dia_data[-1] if st.session_state.bp_dia_data else 78
-    m3.metric("BP (mmHg)", f"{int(bps)}/{int(bpd)}")
-
-    # Placeholders for charts
-    ecg_ph = st.empty()
-    trio_ph = st.empty()
-    alert_ph = st.empty()
-
-    # Update loop (short burst, relies on reruns from Streamlit)
-    burst_iterations = {"Slow": 10, "Normal": 20, "Fast": 35}[speed]
-    if st.session_state.monitoring_on:
-        for i in range(burst_iterations):
-            t = time.time()
-            st.session_state.hb_data.append(generate_ecg_point(t, bpm=bpm))
-            if i % 5 == 0:
-                sp = simulate_spo2_value()
-                st.session_state.spo2_data.append(sp)
-                sy, di = simulate_bp_values()
-                st.session_state.bp_sys_data.append(sy)
-                st.session_state.bp_dia_data.append(di)
-
-            # ECG-like line
-            fig, ax = plt.subplots(figsize=(10, 2.6))
-            ax.plot(list(st.session_state.hb_data), linewidth=1.6)
-            ax.set_ylim(-0.8, 1.8)
-            ax.set_yticks([])
-            ax.set_xticks([])
-            ax.set_title("ECG-like Heart Signal", color="#d4e6ff")
-            ax.set_facecolor("#0b1326")
-            for spine in ax.spines.values():
-                spine.set_color("#2b3b5a")
-            ecg_ph.pyplot(fig, clear_figure=True)
-
-            # Trio chart: SpO2 + BP
-            fig2, ax2 = plt.subplots(figsize=(10, 2.4))
-            ax2.plot(list(st.session_state.spo2_data), label="SpO₂", linewidth=1.6)
-            ax2.plot(list(st.session_state.bp_sys_data), label="BP Systolic", linewidth=1.2)
-            ax2.plot(list(st.session_state.bp_dia_data), label="BP Diastolic", linewidth=1.2)
-            ax2.set_ylim(60, 140)
-            ax2.set_title("SpO₂ and Blood Pressure", color="#d4e6ff")
-            ax2.set_facecolor("#0b1326")
-            ax2.legend()
-            for spine in ax2.spines.values():
-                spine.set_color("#2b3b5a")
-            trio_ph.pyplot(fig2, clear_figure=True)
-
-            # Alerts
-            alerts = []
-            if last_spo2 < 94:
-                alerts.append(f"⚠ Low SpO₂ detected: {last_spo2}%")
-            if bps > 135 or bpd > 90:
-                alerts.append(f"⚠ High BP detected: {int(bps)}/{int(bpd)}")
-
-            if alerts:
-                for a in alerts:
-                    alert_ph.warning(a)
-            else:
-                alert_ph.info("All vitals in safe range.")
+    # Live section reruns on its own every tick while monitoring is on
+    tick_interval = {"Slow": 0.25, "Normal": 0.15, "Fast": 0.08}[speed]
+
+    @st.fragment(run_every=tick_interval if st.session_state.monitoring_on else None)
+    def monitoring_live():
+        ss = st.session_state
+        if ss.monitoring_on:
+            # One ECG sample per tick, SpO₂/BP every 5th tick
+            ss.hb_data.extend(generate_ecg_samples(np.array([time.time()]), bpm=bpm))
+            if ss.mon_tick % 5 == 0:
+                ss.spo2_data.extend(simulate_spo2_values(1))
+                sys_vals, dia_vals = simulate_bp_values(1)
+                ss.bp_sys_data.extend(sys_vals)
+                ss.bp_dia_data.extend(dia_vals)
+            ss.mon_tick += 1
+
+        # Live Metrics
+        m1, m2, m3 = st.columns(3)
+        hb_val = ss.hb_data.last(0.0)
+        m1.metric("ECG (mV)", f"{hb_val:+.2f}")
+        last_spo2 = int(ss.spo2_data.last(98))
+        m2.metric("SpO₂ (%)", f"{last_spo2}")
+        bps = ss.bp_sys_data.last(118)
+        bpd = ss.bp_dia_data.last(78)
+        m3.metric("BP (mmHg)", f"{int(bps)}/{int(bpd)}")
+
+        if not ss.monitoring_on:
+            return
+
+        # ECG-like line
+        ss.ecg_line.set_data(np.arange(len(ss.hb_data)), ss.hb_data.values())
+        ss.ecg_ax.set_xlim(0, len(ss.hb_data))
+        st.pyplot(ss.ecg_fig, clear_figure=False)
+
+        # Trio chart: SpO2 + BP
+        for line, data in zip(ss.vitals_lines, (ss.spo2_data, ss.bp_sys_data, ss.bp_dia_data)):
+            line.set_data(np.arange(len(data)), data.values())
+        ss.vitals_ax.set_xlim(0, max(len(ss.spo2_data) - 1, 1))
+        st.pyplot(ss.vitals_fig, clear_figure=False)
+
+        # Alerts
+        alerts = []
+        if last_spo2 < 94:
+            alerts.append(f"⚠ Low SpO₂ detected: {last_spo2}%")
+        if bps > 135 or bpd > 90:
+            alerts.append(f"⚠ High BP detected: {int(bps)}/{int(bpd)}")
+
+        if alerts:
+            for a in alerts:
+                st.warning(a)
+        else:
+            st.info("All vitals in safe range.")
 
-            time.sleep(0.08)
+    monitoring_live()
 
 # ---------------------------- TAB: ROBOT NAVIGATION ----------------------------
 with tabs[2]:
@@ -377,56 +476,57 @@ with tabs[2]:
                 st.session_state.nav_on = True
                 # Compute path if needed
                 if not st.session_state.path:
-                    st.session_state.path = a_star(start, goal, w, h, st.session_state.obstacles)
+                    plan_path(start, goal)
         else:
             if st.button("🛑 Stop Navigation", key="nav_stop"):
                 st.session_state.nav_on = False
     with c2:
         if st.button("🎲 Randomize Obstacles"):
-            st.session_state.obstacles = randomize_obstacles(w, h, start, goal, density=0.15)
-            st.session_state.path = a_star(start, goal, w, h, st.session_state.obstacles)
+            set_obstacles(randomize_obstacles(w, h, start, goal, density=0.15))
+            plan_path(start, goal)
             st.session_state.robot_pos = start
     with c3:
         if st.button("🔄 Reset Map"):
-            st.session_state.obstacles = set()
-            st.session_state.path = a_star(start, goal, w, h, st.session_state.obstacles)
+            set_obstacles(np.zeros((w, h), dtype=bool))
+            plan_path(start, goal)
             st.session_state.robot_pos = start
     with c4:
         st.session_state.lidar_range = st.slider("LIDAR Range (cells)", 5, 18, st.session_state.lidar_range)
 
     # Ensure path is available
     if not st.session_state.path:
-        st.session_state.path = a_star(start, goal, w, h, st.session_state.obstacles)
+        plan_path(start, goal)
 
     # Plot grid, obstacles, path, robot, goal + lidar
-    nav_placeholder = st.empty()
-    status_placeholder = st.empty()
-
-    def draw_nav():
+    def draw_nav(nav_placeholder):
         cell_px = st.session_state.cell_px
-        fig, ax = plt.subplots(figsize=(12, 7))
-        ax.set_facecolor("#0b1326")
-        # Grid
-        for x in range(w+1):
-            ax.plot([x, x], [0, h], color="#1f2a44", linewidth=0.5)
-        for y in range(h+1):
-            ax.plot([0, w], [y, y], color="#1f2a44", linewidth=0.5)
+        # One figure per session, cleared and redrawn each frame
+        fig, ax = st.session_state.nav_fig, st.session_state.nav_ax
+        ax.cla()
+        # Grid (segments only change with the grid size)
+        if st.session_state.get("grid_segments_wh") != (w, h):
+            st.session_state.grid_segments = grid_segments(w, h)
+            st.session_state.grid_segments_wh = (w, h)
+        ax.add_collection(LineCollection(st.session_state.grid_segments, colors="#1f2a44", linewidths=0.5))
 
         # Obstacles
-        for (ox, oy) in st.session_state.obstacles:
-            ax.add_patch(plt.Rectangle((ox, oy), 1, 1, color="#2e3b5a"))
+        ax.imshow(st.session_state.obs_grid.T, origin="upper", extent=(0, w, h, 0), cmap=OBSTACLE_CMAP,
+                  vmin=0, vmax=1, interpolation="nearest", zorder=1)
 
         # Path
-        if st.session_state.path:
-            px = [p[0]+0.5 for p in st.session_state.path]
-            py = [p[1]+0.5 for p in st.session_state.path]
+        remaining = st.session_state.path[st.session_state.path_idx:]
+        if remaining:
+            px = [p[0]+0.5 for p in remaining]
+            py = [p[1]+0.5 for p in remaining]
             ax.plot(px, py, linewidth=2.2, color="#1dd1a1", alpha=0.9, label="A* Path")
 
         # LIDAR rays
         rp = st.session_state.robot_pos
-        hits = cast_lidar_rays(rp, st.session_state.obstacles, w, h, rays=st.session_state.lidar_rays, max_range=st.session_state.lidar_range)
-        for hx, hy in hits:
-            ax.plot([rp[0]+0.5, hx+0.5], [rp[1]+0.5, hy+0.5], color="#10ac84", alpha=0.35, linewidth=1)
+        hits = cast_lidar_rays(rp, st.session_state.obs_grid, rays=st.session_state.lidar_rays, max_range=st.session_state.lidar_range)
+        rays = np.empty((len(hits), 2, 2))
+        rays[:, 0] = (rp[0]+0.5, rp[1]+0.5)
+        rays[:, 1] = hits + 0.5
+        ax.add_collection(LineCollection(rays, colors="#10ac84", alpha=0.35, linewidths=1))
 
         # Start / Goal / Robot
         ax.add_patch(plt.Circle((start[0]+0.5, start[1]+0.5), 0.38, color="#54a0ff"))
@@ -444,34 +544,35 @@ with tabs[2]:
         ax.invert_yaxis()
         ax.set_xticks([])
         ax.set_yticks([])
-        ax.set_title("Hospital Grid • A* Pathfinding with LIDAR Scan", color="#d4e6ff")
-        for spine in ax.spines.values():
-            spine.set_color("#2b3b5a")
-        nav_placeholder.pyplot(fig, clear_figure=True)
-
-    # Animate robot along path (short burst for each run)
-    if st.session_state.nav_on and st.session_state.path:
-        # If robot at goal, reverse path to return
-        if st.session_state.robot_pos == st.session_state.goal:
-            st.session_state.path = list(reversed(st.session_state.path))
-            st.session_state.goal, st.session_state.start = st.session_state.start, st.session_state.goal
-            status_placeholder.success("Reached Pharmacy ✅ — Returning to Patient Room...")
-
-        steps_per_burst = 8
-        for _ in range(steps_per_burst):
+        style_axes(ax, "Hospital Grid • A* Pathfinding with LIDAR Scan")
+        nav_placeholder.pyplot(fig, clear_figure=False)
+
+    # Animate robot along path, one step per tick while navigation is on
+    @st.fragment(run_every=NAV_TICK if st.session_state.nav_on else None)
+    def navigation_live():
+        nav_placeholder = st.empty()
+        status_placeholder = st.empty()
+        if st.session_state.nav_on and st.session_state.path:
+            # If robot at goal, reverse path to return (it stays valid, no replan needed)
+            if st.session_state.robot_pos == st.session_state.goal:
+                st.session_state.path = st.session_state.path[::-1]
+                st.session_state.path_idx = 0
+                st.session_state.goal, st.session_state.start = st.session_state.start, st.session_state.goal
+                st.session_state.path_key = (st.session_state.start, st.session_state.goal, st.session_state.obs_version)
+                status_placeholder.success("Reached Pharmacy ✅ — Returning to Patient Room...")
+
             # If path empty, recompute
             if not st.session_state.path:
-                st.session_state.path = a_star(st.session_state.robot_pos, st.session_state.goal, w, h, st.session_state.obstacles)
-                if not st.session_state.path:
+                if not plan_path(st.session_state.robot_pos, st.session_state.goal):
                     status_placeholder.error("No path available! Adjust obstacles or reset map.")
-                    break
+                    draw_nav(nav_placeholder)
+                    return
 
             # Move one step along path
-            if len(st.session_state.path) > 1:
-                st.session_state.robot_pos = st.session_state.path[1]
-                st.session_state.path = st.session_state.path[1:]
-            draw_nav()
-            time.sleep(0.08)
+            if st.session_state.path_idx + 1 < len(st.session_state.path):
+                st.session_state.path_idx += 1
+                st.session_state.robot_pos = st.session_state.path[st.session_state.path_idx]
+            draw_nav(nav_placeholder)
 
             # Status line
             if st.session_state.robot_pos == st.session_state.goal:
@@ -480,7 +581,9 @@ with tabs[2]:
                 else:
                     status_placeholder.success("Returned to Patient Room ✅")
 
-    else:
-        draw_nav()
-        if not st.session_state.nav_on:
-            status_placeholder.info("Click **Start Navigation** to begin route.")
+        else:
+            draw_nav(nav_placeholder)
+            if not st.session_state.nav_on:
+                status_placeholder.info("Click **Start Navigation** to begin route.")
+
+    navigation_live()
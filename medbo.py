@@ -1,23 +1,46 @@
 import tkinter as tk
 import customtkinter as ctk
-import random
 import threading
 import time
+import queue
 import pyttsx3
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.animation import FuncAnimation
 from PIL import Image, ImageTk
 
 # ----------------- Text-to-Speech ----------------- #
-engine = pyttsx3.init()
-voices = engine.getProperty('voices')
-engine.setProperty('voice', voices[1].id)  # Female voice
-engine.setProperty('rate', 145)  # Slow and calm
+# pyttsx3 is not thread-safe, so one worker thread owns the engine and speaks queued messages
+tts_q = queue.Queue()
+
+def tts_worker():
+    engine = pyttsx3.init()
+    voices = engine.getProperty('voices')
+    engine.setProperty('voice', voices[1].id)  # Female voice
+    engine.setProperty('rate', 145)  # Slow and calm
+    while True:
+        text = tts_q.get()
+        # Skip stale backlog, only the latest message is worth saying
+        while not tts_q.empty():
+            text = tts_q.get_nowait()
+        engine.say(text)
+        engine.runAndWait()
+
+threading.Thread(target=tts_worker, daemon=True).start()
 
 def speak(text):
-    engine.say(text)
-    engine.runAndWait()
+    tts_q.put(text)
+
+# ----------------- Random Vitals ----------------- #
+rng = np.random.default_rng()
+RNG_BATCH = 10_000
+
+def rng_stream(low, high):
+    """Endless stream of random ints in [low, high] (inclusive, per column), drawn in large batches."""
+    low, high = np.asarray(low), np.asarray(high) + 1
+    while True:
+        yield from rng.integers(low, high, size=(RNG_BATCH,) + low.shape).tolist()
 
 # ----------------- App Window ----------------- #
 app = ctk.CTk()
@@ -31,6 +54,7 @@ monitoring = False
 heart_rate_data = []
 spo2_data = []
 bp_data = []
+N_POINTS = 50   # heart-rate samples shown on the graph
 
 # ----------------- Top Frame with Logo ----------------- #
 top_frame = ctk.CTkFrame(app)
@@ -60,49 +84,52 @@ ax.set_facecolor("black")
 fig.patch.set_facecolor("black")
 ax.tick_params(colors="white")
 ax.set_ylim(50, 150)  # Heart Rate range
+ax.set_xlim(0, N_POINTS)  # fixed, so blitting only redraws the line
 line, = ax.plot([], [], color="lime", linewidth=2)
 canvas = FigureCanvasTkAgg(fig, master=app)
 canvas.get_tk_widget().pack(pady=20)
 
 # ----------------- Animation Function ----------------- #
-x_data = list(range(50))
-y_data = [0] * 50
+x_data = np.arange(N_POINTS)
+y_data = np.zeros(N_POINTS, dtype=np.int32)   # ring buffer, oldest sample at y_data[head]
+head = 0
+hr_stream = rng_stream(60, 120)  # HR
 
 def animate(i):
+    global head
     if monitoring:
-        y_data.pop(0)
-        heart_rate = random.randint(60, 120)  # HR
-        y_data.append(heart_rate)
-        line.set_data(range(len(y_data)), y_data)
-        ax.set_xlim(0, len(y_data))
+        y_data[head] = next(hr_stream)
+        head = (head + 1) % N_POINTS
+        line.set_data(x_data, np.roll(y_data, -head))
     return line,
 
-ani = FuncAnimation(fig, animate, interval=500, blit=True)
+ani = FuncAnimation(fig, animate, interval=500, blit=True, cache_frame_data=False)
 
 # ----------------- Monitoring Logic ----------------- #
 def start_monitoring():
     global monitoring
     monitoring = True
     status_label.configure(text="Monitoring Started...", text_color="green")
-    threading.Thread(target=lambda: speak("Monitoring Started. Please stay calm."), daemon=True).start()
+    speak("Monitoring Started. Please stay calm.")
     threading.Thread(target=update_values, daemon=True).start()
 
 def stop_monitoring():
     global monitoring
     monitoring = False
     status_label.configure(text="Monitoring Stopped", text_color="red")
-    threading.Thread(target=lambda: speak("Monitoring Stopped."), daemon=True).start()
+    speak("Monitoring Stopped.")
 
 def update_values():
+    # (heart rate, SpO2, BP systolic, BP diastolic)
+    vitals = rng_stream((60, 94, 100, 70), (120, 100, 130, 90))
     while monitoring:
-        heart_rate = random.randint(60, 120)
-        spo2 = random.randint(94, 100)
-        bp = f"{random.randint(100, 130)}/{random.randint(70, 90)}"
+        heart_rate, spo2, bp_sys, bp_dia = next(vitals)
+        bp = f"{bp_sys}/{bp_dia}"
 
         condition = "Normal"
         if heart_rate < 60 or heart_rate > 100 or spo2 < 95:
             condition = "Alert ⚠️"
-            threading.Thread(target=lambda: speak("Warning. Abnormal readings detected."), daemon=True).start()
+            speak("Warning. Abnormal readings detected.")
 
         result_label.configure(
             text=f"Heart Rate: {heart_rate} bpm\nSpO₂: {spo2}%\nBP: {bp}\nStatus: {condition}",
@@ -1,7 +1,7 @@
 """
 MEDBO AI — Navigation Simulation with LIDAR-like Scan + A* replanning
 Save as: nav_pygame_lidar.py
-Dependencies: pygame, pyttsx3 (optional for voice)
+Dependencies: pygame, numpy, numba (optional, faster A*), pyttsx3 (optional for voice)
 Place robot.png and pharmacy.png in same folder (or replace icons)
 Controls:
     SPACE - start navigation
@@ -11,8 +11,15 @@ Controls:
     ESC   - quit
 """
 
-import pygame, sys, random, math, heapq, threading, time, queue
+import pygame, sys, heapq, threading, time, queue, functools
 from dataclasses import dataclass
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # ---------- Config ----------
 CELL = 36
@@ -21,10 +28,14 @@ COLS = 20
 WIDTH = COLS * CELL
 HEIGHT = ROWS * CELL + 120
 FPS = 60
+LOGIC_HZ = 120        # robot + obstacle motion / LIDAR / snapshot rate of the logic thread
 ROBOT_SPEED = 140.0   # pixels / second
 OBSTACLE_COUNT = 10
+OBSTACLE_MOVE_P = 0.6    # chance an obstacle tries to move on each obstacle tick
+DYN_DIRS = np.array([[0,0],[1,0],[-1,0],[0,1],[0,-1]], dtype=np.int32)
 LIDAR_RANGE_CELLS = 5    # how many grid cells LIDAR can see (radius)
 LIDAR_ANGLE_STEP = 6     # degrees per LIDAR beam
+TEXT_CACHE_SIZE = 32     # rendered HUD strings kept around
 
 # Colors
 BG = (12, 12, 18)
@@ -42,40 +53,380 @@ DETECTED_COLOR = (255, 160, 60)
 TEXT = (230, 230, 230)
 
 # ---------- A* (grid) ----------
+F_MAX = 64   # initial bucket count; f = g + h on the demo grid stays well below this
+
 def heuristic(a, b):
     return abs(a[0]-b[0]) + abs(a[1]-b[1])
 
-def astar(grid, start, goal):
-    rows, cols = len(grid), len(grid[0])
-    openq = []
-    heapq.heappush(openq, (heuristic(start,goal), 0, start))
-    came = {}
-    g = {start: 0}
-    visited = set()
+def grid_bits(mask):
+    """Pack a 0/1 grid into a Python int bitboard: bit r*cols + c is set for every 1 cell."""
+    return int.from_bytes(np.packbits(mask.ravel(), bitorder='little').tobytes(), 'little')
+
+class BucketQueue:
+    """
+    Priority queue for small non-negative integer priorities (A* f, D* Lite k1): one list per
+    priority. By default a bucket is a plain LIFO stack of items (A* pushes flat cell ints) and
+    nothing is compared. With ordered=True each bucket is a heap and yields its smallest item
+    first, so items must be comparable (D* Lite pushes (k2, cell) tuples for its tie-break).
+    Buckets grow on demand.
+    """
+    def __init__(self, size=F_MAX, ordered=False):
+        self.buckets = [[] for _ in range(size)]
+        self.ordered = ordered
+        self.lo = size   # no bucket below this is non-empty
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, f, item):
+        if f >= len(self.buckets):
+            self.buckets.extend([] for _ in range(f + 1 - len(self.buckets)))
+        if self.ordered:
+            heapq.heappush(self.buckets[f], item)
+        else:
+            self.buckets[f].append(item)
+        if f < self.lo:
+            self.lo = f
+        self.size += 1
+
+    def _first(self):
+        while not self.buckets[self.lo]:
+            self.lo += 1
+        return self.lo
+
+    def peek(self):
+        f = self._first()
+        return f, self.buckets[f][0 if self.ordered else -1]
+
+    def pop(self):
+        f = self._first()
+        bucket = self.buckets[f]
+        self.size -= 1
+        return f, heapq.heappop(bucket) if self.ordered else bucket.pop()
+
+@functools.lru_cache(maxsize=None)
+def _grid_neighbors(rows, cols):
+    """Flat index -> flat indices of its in-bounds 4-neighbors, so A* never bounds-checks."""
+    nbrs = []
+    for idx in range(rows*cols):
+        r, c = divmod(idx, cols)
+        nbrs.append([idx + off for off, ok in ((cols, r < rows-1), (-cols, r > 0), (1, c < cols-1), (-1, c > 0)) if ok])
+    return nbrs
+
+def _astar_py(grid, start, goal):
+    # nodes are flat indices r*cols + c; g / parent / closed are plain lists indexed by them
+    rows, cols = grid.shape
+    n = rows*cols
+    free = (grid.ravel() == 0).tolist()
+    nbrs = _grid_neighbors(rows, cols)
+    gr, gc = goal
+    src, dst = start[0]*cols + start[1], gr*cols + gc
+    g = [n]*n   # no path is n steps long
+    parent = [-1]*n
+    closed = [False]*n
+    g[src] = 0
+    openq = BucketQueue()
+    openq.push(heuristic(start,goal), src)
     while openq:
-        f, cost, current = heapq.heappop(openq)
-        if current == goal:
-            path = [current]
-            while current in came:
-                current = came[current]
-                path.append(current)
+        f, idx = openq.pop()
+        if idx == dst:
+            path = [divmod(idx, cols)]
+            while idx != src:
+                idx = parent[idx]
+                path.append(divmod(idx, cols))
             return path[::-1]
-        if current in visited:
+        if closed[idx]:
             continue
-        visited.add(current)
-        r,c = current
+        closed[idx] = True
+        tentative = g[idx] + 1
+        for nidx in nbrs[idx]:
+            if free[nidx] and tentative < g[nidx]:
+                parent[nidx] = idx
+                g[nidx] = tentative
+                r, c = divmod(nidx, cols)
+                openq.push(tentative + abs(r-gr) + abs(c-gc), nidx)
+    return None
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def astar_nb(grid, sr, sc, gr, gc):
+        # heap entries are packed as (f << 32) | (r*cols + c), so no tuples are hashed
+        rows, cols = grid.shape
+        g = np.full((rows, cols), 2**30, np.int32)
+        parent = np.full((rows, cols), -1, np.int32)
+        closed = np.zeros((rows, cols), np.bool_)
+        heap = np.empty(4*rows*cols + 1, np.int64)   # each cell is pushed at most once per neighbor
+        size = 1
+        heap[0] = (np.int64(abs(sr-gr) + abs(sc-gc)) << 32) | (sr*cols + sc)
+        g[sr, sc] = 0
+        while size > 0:
+            # pop min
+            idx = heap[0] & 0xFFFFFFFF
+            size -= 1
+            heap[0] = heap[size]
+            i = 0
+            while True:
+                child = 2*i + 1
+                if child >= size:
+                    break
+                if child + 1 < size and heap[child+1] < heap[child]:
+                    child += 1
+                if heap[i] <= heap[child]:
+                    break
+                heap[i], heap[child] = heap[child], heap[i]
+                i = child
+            r = idx // cols
+            c = idx % cols
+            if r == gr and c == gc:
+                break
+            if closed[r, c]:
+                continue
+            closed[r, c] = True
+            for k in range(4):
+                nr = r + (1, -1, 0, 0)[k]
+                nc = c + (0, 0, 1, -1)[k]
+                if 0 <= nr < rows and 0 <= nc < cols and grid[nr, nc] == 0:
+                    tentative = g[r, c] + 1
+                    if tentative < g[nr, nc]:
+                        parent[nr, nc] = r*cols + c
+                        g[nr, nc] = tentative
+                        # push
+                        i = size
+                        heap[i] = (np.int64(tentative + abs(nr-gr) + abs(nc-gc)) << 32) | (nr*cols + nc)
+                        size += 1
+                        while i > 0:
+                            up = (i - 1) >> 1
+                            if heap[up] <= heap[i]:
+                                break
+                            heap[up], heap[i] = heap[i], heap[up]
+                            i = up
+        return parent
+
+def astar(grid, start, goal):
+    if not NUMBA_AVAILABLE:
+        return _astar_py(grid, start, goal)
+    parent = astar_nb(grid, start[0], start[1], goal[0], goal[1])
+    if start != goal and parent[goal] < 0:
+        return None
+    cols = grid.shape[1]
+    path = [goal]
+    current = goal
+    while current != start:
+        current = divmod(int(parent[current]), cols)
+        path.append(current)
+    return path[::-1]
+
+# ---------- LIDAR ray cast ----------
+# Amanatides-Woo cell DDA: each beam walks exactly the cells it crosses. t is the distance
+# along the beam, t_max_* where it crosses the next column / row line. A beam stops at
+# max_t, when it leaves the grid (exclusive) or at its first obstacle (inclusive).
+# Returns per beam: last cell reached (row, col), whether it got past the robot's cell, hit.
+def _lidar_dda_py(occ, cx, cy, cell, dx, dy, max_t):
+    # all beams in lockstep, one cell per iteration
+    rows, cols = occ.shape
+    r = np.full(len(dx), int(cy // cell))
+    c = np.full(len(dx), int(cx // cell))
+    step_c = np.where(dx > 0, 1, -1)
+    step_r = np.where(dy > 0, 1, -1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_delta_x = np.abs(cell / dx)
+        t_delta_y = np.abs(cell / dy)
+        t_max_x = np.where(dx > 0, (c + 1)*cell - cx, c*cell - cx) / dx
+        t_max_y = np.where(dy > 0, (r + 1)*cell - cy, r*cell - cy) / dy
+    t_max_x[dx == 0] = np.inf
+    t_max_y[dy == 0] = np.inf
+    active = np.ones(len(dx), dtype=bool)
+    hit = np.zeros(len(dx), dtype=bool)
+    visited = np.zeros(len(dx), dtype=bool)
+    end_r, end_c = r.copy(), c.copy()
+    while active.any():
+        along_x = t_max_x < t_max_y
+        active &= np.minimum(t_max_x, t_max_y) <= max_t
+        mx = active & along_x
+        my = active & ~along_x
+        c[mx] += step_c[mx]; t_max_x[mx] += t_delta_x[mx]
+        r[my] += step_r[my]; t_max_y[my] += t_delta_y[my]
+        active &= (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+        end_r[active] = r[active]
+        end_c[active] = c[active]
+        visited |= active
+        struck = active.copy()
+        struck[active] = occ[r[active], c[active]] == 1
+        hit |= struck
+        active &= ~struck
+    return end_r, end_c, visited, hit
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def lidar_dda_nb(occ, cx, cy, cell, dx, dy, max_t):
+        rows, cols = occ.shape
+        n = dx.shape[0]
+        r0 = int(cy // cell)
+        c0 = int(cx // cell)
+        end_r = np.full(n, r0, np.int64)
+        end_c = np.full(n, c0, np.int64)
+        visited = np.zeros(n, np.bool_)
+        hit = np.zeros(n, np.bool_)
+        for i in range(n):
+            r, c = r0, c0
+            step_c = 1 if dx[i] > 0 else -1
+            step_r = 1 if dy[i] > 0 else -1
+            t_max_x = np.inf
+            t_max_y = np.inf
+            t_delta_x = np.inf
+            t_delta_y = np.inf
+            if dx[i] != 0:
+                t_max_x = (((c + 1)*cell if dx[i] > 0 else c*cell) - cx) / dx[i]
+                t_delta_x = abs(cell / dx[i])
+            if dy[i] != 0:
+                t_max_y = (((r + 1)*cell if dy[i] > 0 else r*cell) - cy) / dy[i]
+                t_delta_y = abs(cell / dy[i])
+            while True:
+                if t_max_x < t_max_y:
+                    if t_max_x > max_t:
+                        break
+                    c += step_c
+                    t_max_x += t_delta_x
+                else:
+                    if t_max_y > max_t:
+                        break
+                    r += step_r
+                    t_max_y += t_delta_y
+                if r < 0 or r >= rows or c < 0 or c >= cols:
+                    break
+                end_r[i] = r
+                end_c[i] = c
+                visited[i] = True
+                if occ[r, c] == 1:
+                    hit[i] = True
+                    break
+        return end_r, end_c, visited, hit
+
+def lidar_dda(occ, cx, cy, cell, dx, dy, max_t):
+    if NUMBA_AVAILABLE:
+        return lidar_dda_nb(occ, float(cx), float(cy), cell, dx, dy, float(max_t))
+    return _lidar_dda_py(occ, cx, cy, cell, dx, dy, max_t)
+
+# ---------- D* Lite (incremental replanning) ----------
+INF = float('inf')
+
+class DStarLite:
+    """
+    D* Lite (Koenig & Likhachev) on a 4-connected grid. Searches backward from the goal,
+    so when the robot moves and cells change only the affected vertices are repaired
+    instead of replanning from scratch. One instance serves one goal.
+    Blocked cells are a grid_bits() bitboard over a (rows, cols) grid.
+    """
+    def __init__(self, blocked, shape, start, goal):
+        self.rows, self.cols = shape
+        self.blocked = blocked
+        self.start = start
+        self.last_start = start
+        self.goal = goal
+        self.km = 0
+        self.g = {}
+        self.rhs = {goal: 0}
+        self.openq = BucketQueue(ordered=True)   # k1 -> heap of (k2, cell)
+        self.open_keys = {}   # cell -> its live key; queue entries with another key are stale
+        self._push(goal)
+
+    def _g(self, s):
+        return self.g.get(s, INF)
+
+    def _rhs(self, s):
+        return self.rhs.get(s, INF)
+
+    def _key(self, s):
+        m = min(self._g(s), self._rhs(s))
+        return (m + heuristic(self.start, s) + self.km, m)
+
+    def _push(self, s):
+        key = self._key(s)
+        self.open_keys[s] = key
+        self.openq.push(key[0], (key[1], s))
+
+    def _top_key(self):
+        while self.openq:
+            k1, (k2, s) = self.openq.peek()
+            if self.open_keys.get(s) == (k1, k2):
+                return (k1, k2)
+            self.openq.pop()
+        return (INF, INF)
+
+    def _neighbors(self, s):
+        r, c = s
         for dr, dc in ((1,0),(-1,0),(0,1),(0,-1)):
             nr, nc = r+dr, c+dc
-            if 0<=nr<rows and 0<=nc<cols and grid[nr][nc]==0:
-                tentative = g[current] + 1
-                if tentative < g.get((nr,nc), 1e9):
-                    came[(nr,nc)] = current
-                    g[(nr,nc)] = tentative
-                    heapq.heappush(openq, (tentative + heuristic((nr,nc), goal), tentative, (nr,nc)))
-    return None
+            if 0<=nr<self.rows and 0<=nc<self.cols:
+                yield (nr, nc)
+
+    def _cost(self, a, b):
+        # entering a blocked cell is impossible; leaving one is allowed (robot may be overlapped)
+        return INF if self.blocked >> (b[0]*self.cols + b[1]) & 1 else 1
+
+    def update_vertex(self, u):
+        if u != self.goal:
+            self.rhs[u] = min((self._cost(u, s) + self._g(s) for s in self._neighbors(u)), default=INF)
+        self.open_keys.pop(u, None)
+        if self._g(u) != self._rhs(u):
+            self._push(u)
+
+    def compute_shortest_path(self):
+        while self._top_key() < self._key(self.start) or self._rhs(self.start) != self._g(self.start):
+            k1, (k2, u) = self.openq.pop()
+            k_old = (k1, k2)
+            del self.open_keys[u]
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u)
+            elif self._g(u) > self._rhs(u):
+                self.g[u] = self._rhs(u)
+                for p in self._neighbors(u):
+                    self.update_vertex(p)
+            else:
+                self.g[u] = INF
+                self.update_vertex(u)
+                for p in self._neighbors(u):
+                    self.update_vertex(p)
+
+    def move_start(self, start):
+        self.km += heuristic(self.last_start, start)
+        self.last_start = start
+        self.start = start
+
+    def update_grid(self, blocked):
+        """Apply a new blocked-cell bitboard, repairing the vertices around every changed cell."""
+        changed = blocked ^ self.blocked
+        self.blocked = blocked
+        while changed:
+            low = changed & -changed
+            changed ^= low
+            u = divmod(low.bit_length() - 1, self.cols)
+            self.update_vertex(u)
+            for s in self._neighbors(u):
+                self.update_vertex(s)
+
+    def extract_path(self):
+        if self._g(self.start) == INF:
+            return None
+        path = [self.start]
+        current = self.start
+        while current != self.goal and len(path) <= self.rows*self.cols:
+            current = min(self._neighbors(current), key=lambda s: self._cost(current, s) + self._g(s))
+            if self._cost(path[-1], current) == INF:
+                return None
+            path.append(current)
+        return path if current == self.goal else None
 
 # ---------- Speech queue (safe pyttsx3) ----------
-speech_q = queue.Queue()
+SPEECH_DEBOUNCE = 2.0   # seconds before the same message may be spoken again
+speech_q = queue.Queue(maxsize=8)
+_last_spoken = {}       # text -> time it was last accepted
+
+def _should_say(text):
+    return time.time() - _last_spoken.get(text, 0.0) >= SPEECH_DEBOUNCE
+
 try:
     import pyttsx3
     def tts_worker():
@@ -99,10 +450,24 @@ try:
             speech_q.task_done()
     threading.Thread(target=tts_worker, daemon=True).start()
     def speak(text):
-        speech_q.put(text)
+        if not _should_say(text):
+            return
+        try:
+            speech_q.put_nowait(text)
+        except queue.Full:
+            return   # the sim never waits on the voice; not recorded, so it may be retried
+        _last_spoken[text] = time.time()
 except Exception:
     def speak(text):
-        print("[SAY]", text)
+        if _should_say(text):
+            _last_spoken[text] = time.time()
+            print("[SAY]", text)
+
+def stop_speech():
+    try:
+        speech_q.put_nowait(None)
+    except queue.Full:
+        pass
 
 # ---------- Simulation class ----------
 @dataclass
@@ -116,26 +481,50 @@ class NavSim:
         pygame.init()
         pygame.display.set_caption("MEDBO AI — LIDAR Navigation")
         self.cfg = cfg
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF)
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Consolas", 16)
         self.big = pygame.font.SysFont("Consolas", 20, bold=True)
+        self._info_surf = self.big.render("SPACE:Start  P:Pause  R:Reset  O:Toggle Obstacles  ESC:Quit", True, TEXT).convert_alpha()
+        self._text_cache = {}   # (font id, text) -> Surface, oldest evicted first
+        # only areas that changed are pushed to the display; a full flip after (re)start
+        self._full_redraw = True
+        self._dirty_prev = []   # rects drawn last frame, must be cleared on screen this frame
+        self._hud_state = None
 
         # occupancy grid: 0 free, 1 static wall
-        self.grid = [[0]*self.cfg.cols for _ in range(self.cfg.rows)]
+        self.grid = np.zeros((self.cfg.rows, self.cfg.cols), dtype=np.uint8)
         # add demo static walls
-        for r in range(3, 11):
-            self.grid[r][7] = 1
-        for c in range(6, 16):
-            self.grid[9][c] = 1
-        self.grid[9][10] = 0
+        self.grid[3:11, 7] = 1
+        self.grid[9, 6:16] = 1
+        self.grid[9, 10] = 0
+        self._wall_bits = grid_bits(self.grid)
+        self._bg = pygame.Surface((WIDTH, HEIGHT-120)).convert()
+        self._rebuild_bg()
 
         # start / goal
         self.start = (self.cfg.rows - 2, 2)
         self.goal = (2, self.cfg.cols - 3)
+        # flat indices of cells an obstacle may ever occupy (not a wall, start or goal)
+        free = self.grid.ravel() == 0
+        free[[self.start[0]*self.cfg.cols + self.start[1], self.goal[0]*self.cfg.cols + self.goal[1]]] = False
+        self._free_cells = np.flatnonzero(free)
+
+        # pixel centers of every column / row, so nothing recomputes c*cell + cell//2
+        self._cx = np.arange(self.cfg.cols)*self.cfg.cell + self.cfg.cell//2
+        self._cy = np.arange(self.cfg.rows)*self.cfg.cell + self.cfg.cell//2
+
+        # LIDAR (cos, sin) per beam angle, fixed for the whole run
+        beam_rad = np.deg2rad(np.arange(0, 360, LIDAR_ANGLE_STEP))
+        self._trig = np.column_stack((np.cos(beam_rad), np.sin(beam_rad)))
+        self._beam_idx = np.arange(len(self._trig))
 
         # dynamic obstacles
-        self.dynamic = set()
+        self._dyn_pos = np.empty((0, 2), dtype=np.int32)  # (N, 2) obstacle cells (row, col)
+        self._dyn_mask = np.zeros_like(self.grid)        # kept in sync with self._dyn_pos
+        self._detected_mask = np.zeros_like(self.grid)   # kept in sync with self.detected_cells
+        self._dyn_bits = 0    # grid_bits() of the two masks above, for O(1) cell tests / diffs
+        self._det_bits = 0
         self.spawn_dynamic(OBSTACLE_COUNT)
 
         # robot state
@@ -143,17 +532,32 @@ class NavSim:
         self.robot_pos = self.cell_center(self.robot_cell)
         self.path = []
         self.path_index = 0
+        self._path_bits = 0           # bitboard of path[path_index:], what a new obstacle must hit to matter
+        self._seg = []                # (ux, uy, length) of the leg into each path cell, see _set_path
+        self._traveled = 0.0          # distance covered along the current leg
+        self._obs_prev = 0            # dynamic | detected bits at the last path check
+        self._trail = []              # cells visited on the way out, candidate return path
+        self._trail_bits = 0
         self.moving = False
         self.paused = False
         self.returning = False
+        self._dwell = 0.0             # pause at the pharmacy before heading back (seconds)
 
         self.last_obs_move = time.time()
-        self.last_lidar_angle = 0.0
+        self._rot_idx = 0             # LIDAR sweep rotation, in beams
         self.detected_cells = set()   # cells LIDAR currently sees as obstacles
+        self.planner = None           # DStarLite for the current goal, built on first replan
 
         self.log_lines = []
         self.add_log("Ready. Press SPACE to start navigation.")
 
+        # logic thread publishes a snapshot, the display thread only draws from it
+        self._logic_lock = threading.RLock()    # world state: logic tick vs. key handlers
+        self._render_lock = threading.Lock()    # guards _render_state
+        self._render_state = {}
+        self._sensors = np.empty((0, 2, 2), dtype=np.int32)
+        self._publish()
+
     # helpers
     def add_log(self, txt):
         self.log_lines.append(f"{time.strftime('%H:%M:%S')} | {txt}")
@@ -162,120 +566,217 @@ class NavSim:
         print(txt)
 
     def spawn_dynamic(self, n):
-        free = [(r,c) for r in range(self.cfg.rows) for c in range(self.cfg.cols)
-                if self.grid[r][c]==0 and (r,c)!=self.start and (r,c)!=self.goal]
-        random.shuffle(free)
-        for i in range(min(n, len(free))):
-            self.dynamic.add(free[i])
+        free = self._free_cells[self._dyn_mask.ravel()[self._free_cells] == 0]
+        pick = np.random.choice(free, min(n, len(free)), replace=False)
+        new = np.column_stack(np.divmod(pick, self.cfg.cols)).astype(np.int32)
+        self._dyn_pos = np.concatenate((self._dyn_pos, new))
+        self._dyn_mask[new[:, 0], new[:, 1]] = 1
+        self._dyn_bits = grid_bits(self._dyn_mask)
+
+    def clear_dynamic(self):
+        self._dyn_pos = self._dyn_pos[:0]
+        self._dyn_mask[:] = 0
+        self._dyn_bits = 0
+
+    def _rebuild_bg(self):
+        # static grid + walls, redrawn only when the walls change
+        self._bg.fill(BG)
+        for r in range(self.cfg.rows):
+            for c in range(self.cfg.cols):
+                x = c*self.cfg.cell; y = r*self.cfg.cell
+                rect = pygame.Rect(x,y,self.cfg.cell,self.cfg.cell)
+                color = WALL if self.grid[r, c]==1 else CELL_FREE
+                pygame.draw.rect(self._bg, color, rect)
+                pygame.draw.rect(self._bg, GRID, rect, 1)
 
     def cell_center(self, cell):
         r,c = cell
-        x = c*self.cfg.cell + self.cfg.cell//2
-        y = r*self.cfg.cell + self.cfg.cell//2
-        return [float(x), float(y)]
+        return [float(self._cx[c]), float(self._cy[r])]
 
     def current_grid(self):
-        g = [row[:] for row in self.grid]
-        for (r,c) in self.dynamic:
-            g[r][c] = 1
-        # incorporate detected (LIDAR) obstacles too (simulated sensor)
-        for (r,c) in self.detected_cells:
-            if 0 <= r < self.cfg.rows and 0 <= c < self.cfg.cols:
-                g[r][c] = 1
-        return g
+        # static walls + dynamic + detected (LIDAR) obstacles (simulated sensor)
+        return self.grid | self._dyn_mask | self._detected_mask
+
+    def blocked_bits(self):
+        # same as current_grid(), as a bitboard
+        return self._wall_bits | self._dyn_bits | self._det_bits
+
+    def _bit(self, cell):
+        return 1 << (cell[0]*self.cfg.cols + cell[1])
 
     def toggle_dynamic(self):
-        if self.dynamic:
-            self.dynamic.clear(); self.add_log("Dynamic obstacles OFF")
+        if len(self._dyn_pos):
+            self.clear_dynamic(); self.add_log("Dynamic obstacles OFF")
         else:
             self.spawn_dynamic(OBSTACLE_COUNT); self.add_log("Dynamic obstacles ON")
 
     def compute_path(self, start_cell, goal_cell):
-        g = self.current_grid()
-        return astar(g, start_cell, goal_cell)
+        # D* Lite: reuse the previous search for the same goal, repairing only what changed
+        blocked = self.blocked_bits()
+        if self.planner is None or self.planner.goal != goal_cell:
+            self.planner = DStarLite(blocked, self.grid.shape, start_cell, goal_cell)
+        else:
+            self.planner.move_start(start_cell)
+            self.planner.update_grid(blocked)
+        self.planner.compute_shortest_path()
+        return self.planner.extract_path()
 
     # dynamic obstacles movement
     def move_dynamic(self):
-        newset = set()
-        for (r,c) in list(self.dynamic):
-            if random.random() < 0.6:
-                dirs = [(0,0),(1,0),(-1,0),(0,1),(0,-1)]
-                random.shuffle(dirs)
-                moved = False
-                for dr,dc in dirs:
-                    nr, nc = r+dr, c+dc
-                    if 0<=nr<self.cfg.rows and 0<=nc<self.cfg.cols and self.grid[nr][nc]==0 and (nr,nc) not in self.dynamic and (nr,nc)!=self.start and (nr,nc)!=self.goal:
-                        newset.add((nr,nc)); moved=True; break
-                if not moved:
-                    newset.add((r,c))
-            else:
-                newset.add((r,c))
-        self.dynamic = newset
+        n = len(self._dyn_pos)
+        rows, cols = self.cfg.rows, self.cfg.cols
+        # every obstacle draws one direction; (0,0) or a blocked target means it stays put
+        moving = np.random.rand(n) < OBSTACLE_MOVE_P
+        pick = np.random.randint(0, len(DYN_DIRS), n)
+        cand = self._dyn_pos + DYN_DIRS[pick] * moving[:, None]
+        r, c = cand[:, 0], cand[:, 1]
+        ok = (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+        rs, cs = np.where(ok, r, 0), np.where(ok, c, 0)
+        ok &= (self.grid[rs, cs] == 0) & (self._dyn_mask[rs, cs] == 0)
+        ok &= ~((r == self.start[0]) & (c == self.start[1]))
+        ok &= ~((r == self.goal[0]) & (c == self.goal[1]))
+        # two obstacles heading for the same free cell: the first one gets it
+        idx = np.flatnonzero(ok)
+        _, first = np.unique(r[idx]*cols + c[idx], return_index=True)
+        idx = idx[first]
+        # movers only enter cells that were free, so clearing then setting never collides
+        self._dyn_mask[self._dyn_pos[idx, 0], self._dyn_pos[idx, 1]] = 0
+        self._dyn_mask[cand[idx, 0], cand[idx, 1]] = 1
+        self._dyn_pos[idx] = cand[idx]
+        self._dyn_bits = grid_bits(self._dyn_mask)
 
     # LIDAR-like scan: rotate a beam sweep and mark detected obstacle cells
     def lidar_scan(self):
         # compute robot cell center and angle sweep
         cx, cy = self.robot_pos
-        sensors = []
-        detected = set()
-        for angle_deg in range(0, 360, LIDAR_ANGLE_STEP):
-            angle = math.radians(angle_deg + int(self.last_lidar_angle))
-            # cast ray cell-by-cell up to range
-            for d in range(1, LIDAR_RANGE_CELLS+1):
-                rr = int((cy + math.sin(angle)*(d*self.cfg.cell)) // self.cfg.cell)
-                cc = int((cx + math.cos(angle)*(d*self.cfg.cell)) // self.cfg.cell)
-                if 0 <= rr < self.cfg.rows and 0 <= cc < self.cfg.cols:
-                    sensors.append(((cx, cy), (cc*self.cfg.cell + self.cfg.cell//2, rr*self.cfg.cell + self.cfg.cell//2)))
-                    # if obstacle present at (rr,cc) either static or dynamic -> detection
-                    if self.grid[rr][cc] == 1 or (rr,cc) in self.dynamic:
-                        detected.add((rr,cc))
-                        break
-                else:
-                    break
-        # rotate sweep slowly
-        self.last_lidar_angle = (self.last_lidar_angle + 6) % 360
+        cell = self.cfg.cell
+        dx, dy = self._trig[(self._beam_idx + self._rot_idx) % len(self._trig)].T
+        end_r, end_c, visited, hit = lidar_dda(self.grid | self._dyn_mask, cx, cy, cell,
+                                               dx, dy, LIDAR_RANGE_CELLS * cell)
+        # (N, 2, 2) int32 ray segments: robot center -> center of the last cell of every beam
+        sensors = np.empty((int(visited.sum()), 2, 2), dtype=np.int32)
+        sensors[:, 0] = (cx, cy)
+        sensors[:, 1, 0] = self._cx[end_c[visited]]
+        sensors[:, 1, 1] = self._cy[end_r[visited]]
+        hr, hc = end_r[hit], end_c[hit]
+        detected = set(zip(hr.tolist(), hc.tolist()))
+        # rotate sweep slowly, one beam step per scan
+        self._rot_idx = (self._rot_idx + 1) % len(self._trig)
+        detected_mask = np.zeros_like(self.grid)
+        detected_mask[hr, hc] = 1
         self.detected_cells = detected
+        self._detected_mask = detected_mask
+        self._det_bits = grid_bits(detected_mask)
         return sensors, detected
 
-    # robot animation along path
-    def animate_robot(self, path, speed):
-        if not path:
-            self.add_log("No path found.")
-            speak("No path found.")
-            self.moving = False
-            return
-        self.add_log(f"Path found ({len(path)} steps). Starting navigation.")
-        speak("Starting navigation to pharmacy.")
-        self.moving = True
-        self.returning = False
+    # logic thread: robot + obstacle motion, sensing, snapshot for the renderer
+    def _logic_tick(self, dt):
+        with self._logic_lock:
+            self._step_motion(dt)
+            # move dynamic obstacles periodically
+            if time.time() - self.last_obs_move > 0.8:
+                if len(self._dyn_pos):
+                    self.move_dynamic()
+                self.last_obs_move = time.time()
+            self._sensors, _ = self.lidar_scan()
+            self._check_path()
+            self._publish()
+
+    def _set_path(self, path, index=0):
         self.path = path
-        self.path_index = 0
-        # iterate steps
-        for _ in range(1000000):
-            if not self.moving:
-                self.add_log("Navigation aborted.")
-                return
-            if self.paused:
-                time.sleep(0.05); continue
+        self.path_index = index
+        bits = 0
+        for cell in path[index:]:
+            bits |= self._bit(cell)
+        self._path_bits = bits
+        # unit vector + length of the leg into every remaining cell, so motion is a multiply-add per
+        # tick; the first leg starts wherever the robot is now, the others at the previous center
+        self._traveled = 0.0
+        self._seg = [None]*index
+        if index < len(path):
+            rc = np.array(path[index:])
+            xs = self._cx[rc[:, 1]].astype(float); ys = self._cy[rc[:, 0]].astype(float)
+            dx = np.diff(xs, prepend=self.robot_pos[0]); dy = np.diff(ys, prepend=self.robot_pos[1])
+            ln = np.hypot(dx, dy)
+            ux = np.divide(dx, ln, out=np.zeros_like(dx), where=ln > 0)
+            uy = np.divide(dy, ln, out=np.zeros_like(dy), where=ln > 0)
+            self._seg += list(zip(ux.tolist(), uy.tolist(), ln.tolist()))
+
+    def _check_path(self):
+        # replan only when a cell that just became blocked lies on the rest of the path; while
+        # stopped the baseline is left alone, so whatever landed meanwhile is seen on resume
+        if not self.moving or self.paused:
+            return
+        obs = self._dyn_bits | self._det_bits
+        newly_blocked = obs & ~self._obs_prev
+        self._obs_prev = obs
+        if not newly_blocked & self._path_bits:
+            return
+        self.add_log("Path blocked ahead. Replanning...")
+        goalcell = self.start if self.returning else self.goal
+        newp = self.compute_path(self.robot_cell, goalcell)
+        if newp:
+            # keep heading for the current target cell if the new route goes through it anyway
+            target = self.path[self.path_index]
+            self._set_path(newp, 1 if len(newp) > 1 and newp[1] == target else 0)
+        # no route right now: keep the old one, the arrival check aborts if it is really blocked
+
+    def _logic_loop(self):
+        period = 1.0 / LOGIC_HZ
+        last = time.perf_counter()
+        while True:
+            t0 = time.perf_counter()
+            self._logic_tick(t0 - last)
+            last = t0
+            time.sleep(max(0.0, period - (time.perf_counter() - t0)))
+
+    def _publish(self):
+        snap = {
+            'robot_pos': tuple(self.robot_pos),
+            'robot_cell': self.robot_cell,
+            'path': list(self.path),
+            'dynamic': self._dyn_pos.tolist(),
+            'detected': list(self.detected_cells),
+            'sensors': self._sensors,
+            'returning': self.returning,
+            'log_lines': list(self.log_lines),
+        }
+        with self._render_lock:
+            self._render_state = snap
+
+    # robot motion along path, integrated by the logic thread
+    def _step_motion(self, dt):
+        if not self.moving or self.paused:
+            return
+        if self._dwell > 0:
+            self._dwell -= dt
+            return
+        budget = ROBOT_SPEED * dt   # pixels left to travel this tick
+        while self.moving:
             if self.path_index >= len(self.path):
                 # reached end
                 if not self.returning:
                     self.add_log("Reached pharmacy.")
                     speak("Reached pharmacy.")
-                    time.sleep(0.6)
+                    self._dwell = 0.6
                     self.returning = True
-                    # compute return path
-                    newpath = self.compute_path(self.goal, self.start)
+                    # compute return path; the way we came is reused when it is provably still a
+                    # shortest way home: unblocked and as short as the Manhattan bound
+                    back = self._trail[::-1]
+                    if (back[-1] == self.start and len(back) - 1 == heuristic(self.goal, self.start)
+                            and not self.blocked_bits() & self._trail_bits):
+                        newpath = back
+                    else:
+                        newpath = self.compute_path(self.goal, self.start)
                     if not newpath:
                         self.add_log("No return path found.")
                         speak("No return path found.")
                         self.moving = False
                         return
-                    self.path = newpath
-                    self.path_index = 0
+                    self._set_path(newpath)
                     self.add_log("Return path computed. Heading back.")
                     speak("Returning to patient room.")
-                    continue
+                    return
                 else:
                     self.add_log("Returned to start. Navigation complete.")
                     speak("Navigation complete.")
@@ -283,41 +784,42 @@ class NavSim:
                     return
             # move towards next cell
             target = self.path[self.path_index]
-            tx, ty = self.cell_center(target)
-            rx, ry = self.robot_pos
-            dx = tx - rx; dy = ty - ry
-            dist = math.hypot(dx, dy)
-            step = ROBOT_SPEED * speed
-            if dist < 4:
-                # arrive at cell
-                self.robot_cell = target
-                self.robot_pos = [tx, ty]
-                self.path_index += 1
-                # If next cell blocked by dynamic or detected obstacle -> replan
-                if self.path_index < len(self.path):
-                    nxt = self.path[self.path_index]
-                    if nxt in self.dynamic or self.grid[nxt[0]][nxt[1]]==1 or nxt in self.detected_cells:
-                        self.add_log("Obstacle detected on path. Replanning...")
-                        speak("Obstacle detected on path. Recalculating route.")
-                        goalcell = self.start if self.returning else self.goal
-                        newp = self.compute_path(self.robot_cell, goalcell)
-                        if newp:
-                            self.path = newp
-                            self.path_index = 0
-                            self.add_log("New path found, resuming.")
-                            continue
-                        else:
-                            self.add_log("No alternative path found.")
-                            speak("No alternative path found. Aborting navigation.")
-                            self.moving = False
-                            return
-                continue
-            # interpolation move
-            self.robot_pos[0] += dx / dist * step
-            self.robot_pos[1] += dy / dist * step
-            time.sleep(speed)
+            ux, uy, seg_len = self._seg[self.path_index]
+            left = seg_len - self._traveled
+            if left > budget:
+                # interpolation move, out of budget for this tick
+                self.robot_pos[0] += ux * budget
+                self.robot_pos[1] += uy * budget
+                self._traveled += budget
+                return
+            # arrive at cell
+            budget -= left
+            self._traveled = 0.0
+            self.robot_cell = target
+            self.robot_pos = self.cell_center(target)
+            self.path_index += 1
+            self._path_bits &= ~self._bit(target)
+            if not self.returning and target != self._trail[-1]:
+                self._trail.append(target)
+                self._trail_bits |= self._bit(target)
+            # If next cell blocked by dynamic or detected obstacle -> replan
+            if self.path_index < len(self.path):
+                nxt = self.path[self.path_index]
+                if self.blocked_bits() & self._bit(nxt):
+                    self.add_log("Obstacle detected on path. Replanning...")
+                    speak("Obstacle detected on path. Recalculating route.")
+                    goalcell = self.start if self.returning else self.goal
+                    newp = self.compute_path(self.robot_cell, goalcell)
+                    if newp:
+                        self._set_path(newp)
+                        self.add_log("New path found, resuming.")
+                    else:
+                        self.add_log("No alternative path found.")
+                        speak("No alternative path found. Aborting navigation.")
+                        self.moving = False
+                        return
 
-    def start_navigation(self, speed=0.02):
+    def start_navigation(self):
         if self.moving:
             self.add_log("Already navigating")
             return
@@ -328,104 +830,128 @@ class NavSim:
             self.add_log("No initial path found.")
             speak("No initial path found.")
             return
-        # run animate in thread to not block UI
-        threading.Thread(target=self.animate_robot, args=(path, speed), daemon=True).start()
+        self.add_log(f"Path found ({len(path)} steps). Starting navigation.")
+        speak("Starting navigation to pharmacy.")
+        self.returning = False
+        self._set_path(path)
+        self._trail = [self.robot_cell]
+        self._trail_bits = self._bit(self.robot_cell)
+        self._dwell = 0.0
+        self.moving = True   # _step_motion picks it up on the next logic tick
 
     def stop_navigation(self):
+        if self.moving:
+            self.add_log("Navigation aborted.")
         self.moving = False
 
     def reset(self):
-        self.dynamic.clear()
+        self.clear_dynamic()
         self.spawn_dynamic(OBSTACLE_COUNT)
         self.robot_cell = self.start
         self.robot_pos = self.cell_center(self.robot_cell)
-        self.path = []
-        self.path_index = 0
+        self._set_path([])
         self.moving = False
         self.returning = False
+        self._dwell = 0.0
         self.detected_cells.clear()
+        self._detected_mask[:] = 0
+        self._det_bits = 0
+        self.planner = None
+        self._rebuild_bg()
+        self._full_redraw = True
         self.add_log("Simulation reset.")
 
+    def _text(self, font, txt):
+        # HUD lines only change when their values do, so render each string once
+        key = (id(font), txt)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) >= TEXT_CACHE_SIZE:
+                del self._text_cache[next(iter(self._text_cache))]
+            surf = self._text_cache[key] = font.render(txt, True, TEXT).convert_alpha()
+        return surf
+
     def draw(self):
-        self.screen.fill(BG)
-        # draw grid cells
-        for r in range(self.cfg.rows):
-            for c in range(self.cfg.cols):
-                x = c*self.cfg.cell; y = r*self.cfg.cell
-                rect = pygame.Rect(x,y,self.cfg.cell,self.cfg.cell)
-                color = WALL if self.grid[r][c]==1 else CELL_FREE
-                pygame.draw.rect(self.screen, color, rect)
-                pygame.draw.rect(self.screen, GRID, rect, 1)
+        with self._render_lock:
+            st = self._render_state
+        cell = self.cfg.cell
+        dirty = []
+        # static grid cells (HUD below is repainted every frame)
+        self.screen.blit(self._bg, (0, 0))
         # draw dynamic obstacles
-        for (r,c) in self.dynamic:
-            pygame.draw.rect(self.screen, DYN_OBS, (c*self.cfg.cell+6, r*self.cfg.cell+6, self.cfg.cell-12, self.cfg.cell-12), border_radius=6)
-        # draw goal/start
-        sx = self.start[1]*self.cfg.cell + self.cfg.cell//2; sy = self.start[0]*self.cfg.cell + self.cfg.cell//2
-        gx = self.goal[1]*self.cfg.cell + self.cfg.cell//2; gy = self.goal[0]*self.cfg.cell + self.cfg.cell//2
-        pygame.draw.circle(self.screen, START_CLR, (sx, sy), self.cfg.cell//3)
-        pygame.draw.circle(self.screen, GOAL_CLR, (gx, gy), self.cfg.cell//3)
+        for (r,c) in st['dynamic']:
+            dirty.append(pygame.draw.rect(self.screen, DYN_OBS, (c*cell+6, r*cell+6, cell-12, cell-12), border_radius=6))
+        # draw goal/start (never move; anything drawn over them is in dirty already)
+        pygame.draw.circle(self.screen, START_CLR, (self._cx[self.start[1]], self._cy[self.start[0]]), cell//3)
+        pygame.draw.circle(self.screen, GOAL_CLR, (self._cx[self.goal[1]], self._cy[self.goal[0]]), cell//3)
         # draw current planned path
-        if self.path:
-            pts = []
-            for (r,c) in self.path:
-                pts.append((c*self.cfg.cell + self.cfg.cell//2, r*self.cfg.cell + self.cfg.cell//2))
+        if st['path']:
+            pts = [(self._cx[c], self._cy[r]) for r,c in st['path']]
             if len(pts) > 1:
-                pygame.draw.lines(self.screen, PATH_CLR, False, pts, 4)
+                dirty.append(pygame.draw.lines(self.screen, PATH_CLR, False, pts, 4))
         # draw robot
-        rx, ry = int(self.robot_pos[0]), int(self.robot_pos[1])
-        pygame.draw.circle(self.screen, ROBOT_CLR, (rx, ry), self.cfg.cell//3)
+        rx, ry = int(st['robot_pos'][0]), int(st['robot_pos'][1])
+        dirty.append(pygame.draw.circle(self.screen, ROBOT_CLR, (rx, ry), cell//3))
         # draw lidar rays and mark detected cells
-        sensors, detected = self.lidar_scan()
-        for ray in sensors:
-            pygame.draw.line(self.screen, LIDAR_COLOR, ray[0], ray[1], 1)
-        for (r,c) in detected:
-            cx = c*self.cfg.cell + self.cfg.cell//2; cy = r*self.cfg.cell + self.cfg.cell//2
-            pygame.draw.circle(self.screen, DETECTED_COLOR, (cx, cy), 6)
+        # one polyline center->end->center->... draws every ray in a single call
+        if len(st['sensors']):
+            dirty.append(pygame.draw.lines(self.screen, LIDAR_COLOR, False, st['sensors'].reshape(-1, 2).tolist(), 1))
+        for (r,c) in st['detected']:
+            dirty.append(pygame.draw.circle(self.screen, DETECTED_COLOR, (self._cx[c], self._cy[r]), 6))
         # hud
-        hud_y = self.cfg.rows*self.cfg.cell
-        pygame.draw.rect(self.screen, HUD_BG, (0, hud_y, WIDTH, HEIGHT - hud_y))
-        info = f"SPACE:Start  P:Pause  R:Reset  O:Toggle Obstacles  ESC:Quit"
-        self.screen.blit(self.big.render(info, True, TEXT), (8, hud_y + 6))
+        hud_y = self.cfg.rows*cell
+        hud = pygame.draw.rect(self.screen, HUD_BG, (0, hud_y, WIDTH, HEIGHT - hud_y))
+        self.screen.blit(self._info_surf, (8, hud_y + 6))
         # logs
-        for i, line in enumerate(self.log_lines):
-            self.screen.blit(self.font.render(line, True, TEXT), (8, hud_y + 36 + i*18))
+        for i, line in enumerate(st['log_lines']):
+            self.screen.blit(self._text(self.font, line), (8, hud_y + 36 + i*18))
         # sensor status
-        sens = f"Detected Cells: {len(self.detected_cells)}"
-        self.screen.blit(self.font.render(sens, True, TEXT), (WIDTH - 260, hud_y + 36))
+        sens = f"Detected Cells: {len(st['detected'])}"
+        self.screen.blit(self._text(self.font, sens), (WIDTH - 260, hud_y + 36))
         # robot cell & path length
-        cur = f"Robot cell: {self.robot_cell}   Path steps: {len(self.path)}   Returning: {self.returning}"
-        self.screen.blit(self.font.render(cur, True, TEXT), (8, hud_y + 36 + 7*18))
-        pygame.display.flip()
+        cur = f"Robot cell: {st['robot_cell']}   Path steps: {len(st['path'])}   Returning: {st['returning']}"
+        self.screen.blit(self._text(self.font, cur), (8, hud_y + 36 + 7*18))
+        hud_state = (st['log_lines'], sens, cur)
+        if hud_state != self._hud_state:
+            self._hud_state = hud_state
+            dirty.append(hud)
+        if self._full_redraw:
+            self._full_redraw = False
+            pygame.display.flip()
+        else:
+            # last frame's rects too, so whatever moved away gets erased
+            pygame.display.update(self._dirty_prev + dirty)
+        self._dirty_prev = dirty
 
     def run(self):
+        # SDL wants the display and its event queue on this (main) thread, so it renders;
+        # robot motion, obstacle motion and LIDAR run on the logic thread
         self.last_obs_move = time.time()
+        threading.Thread(target=self._logic_loop, daemon=True).start()
         while True:
             dt = self.clock.tick(FPS) / 1000.0
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    if 'speech_q' in globals():
-                        speech_q.put(None)
+                    stop_speech()
                     pygame.quit(); sys.exit()
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    # the OS threw away the window contents, dirty rects alone won't restore them
+                    self._full_redraw = True
                 elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
-                        self.start_navigation(speed=0.02)
-                    elif event.key == pygame.K_p:
-                        self.paused = not self.paused
-                        self.add_log(f"Paused={self.paused}")
-                    elif event.key == pygame.K_r:
-                        self.reset()
-                    elif event.key == pygame.K_o:
-                        self.toggle_dynamic()
-                    elif event.key == pygame.K_ESCAPE:
-                        if 'speech_q' in globals():
-                            speech_q.put(None)
+                    if event.key == pygame.K_ESCAPE:
+                        stop_speech()
                         pygame.quit(); sys.exit()
-            # move dynamic obstacles periodically
-            if time.time() - self.last_obs_move > 0.8:
-                if self.dynamic:
-                    self.move_dynamic()
-                self.last_obs_move = time.time()
-            # draw
+                    with self._logic_lock:
+                        if event.key == pygame.K_SPACE:
+                            self.start_navigation()
+                        elif event.key == pygame.K_p:
+                            self.paused = not self.paused
+                            self.add_log(f"Paused={self.paused}")
+                        elif event.key == pygame.K_r:
+                            self.reset()
+                        elif event.key == pygame.K_o:
+                            self.toggle_dynamic()
+            # draw the latest snapshot from the logic thread
             self.draw()
 
 # ---------- run ----------